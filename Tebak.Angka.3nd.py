@@ -2,17 +2,627 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 import random
 import json
+import heapq
+import argparse
+import asyncio
+import threading
+import hashlib
+import time
+import cProfile
+import os
+import queue
+import struct
+import tempfile
+import stat
+from urllib.parse import urlsplit, parse_qs
 from datetime import datetime
 import logging
 
+# ==================== LEADERBOARD MERGE ====================
+UKURAN_CHUNK = 64 * 1024
+BATAS_ENTRI = 1024 * 1024
+
+
+def iter_leaderboard_file(path):
+    """Baca entri leaderboard satu per satu tanpa memuat seluruh file"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        mulai = False
+        eof = False
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buffer) and not eof:
+                chunk = f.read(UKURAN_CHUNK)
+                buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+                continue
+            if pos >= len(buffer):
+                if not mulai:
+                    # File kosong dianggap leaderboard kosong, sama seperti load_leaderboard
+                    return
+                raise ValueError(f"{path}: leaderboard tidak lengkap")
+
+            if not mulai:
+                if buffer[pos] != '[':
+                    raise ValueError(f"{path}: leaderboard harus berupa list")
+                mulai = True
+                pos += 1
+                continue
+            if buffer[pos] == ']':
+                return
+
+            try:
+                entry, akhir = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                # Hanya minta data tambahan jika entri terpotong di akhir buffer
+                terpotong = e.pos >= len(buffer) - 6 or e.msg.startswith("Unterminated string")
+                if eof or not terpotong:
+                    raise ValueError(f"{path}: entri leaderboard rusak ({e.msg})") from e
+                if len(buffer) - pos > BATAS_ENTRI:
+                    raise ValueError(f"{path}: entri leaderboard terlalu besar") from e
+                chunk = f.read(UKURAN_CHUNK)
+                buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+                continue
+            if not isinstance(entry, dict):
+                raise ValueError(f"{path}: entri leaderboard harus berupa object")
+            yield entry
+            pos = akhir
+
+
+def _urutan_entri(entry):
+    """Kunci urutan global: skor tertinggi dulu, lalu yang lebih awal"""
+    tanggal = datetime.strptime(entry["tanggal"], "%d-%m-%Y %H:%M:%S")
+    return (-entry["skor"], tanggal)
+
+
+def _cek_terurut(path, entries):
+    """Hasilkan (kunci, entri) dan pastikan input terurut menurut _urutan_entri"""
+    kunci_sebelumnya = None
+    for entry in entries:
+        try:
+            kunci = _urutan_entri(entry)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{path}: entri leaderboard tidak valid ({e})") from e
+        if kunci_sebelumnya is not None and kunci < kunci_sebelumnya:
+            raise ValueError(f"{path}: leaderboard tidak terurut berdasarkan skor dan tanggal")
+        kunci_sebelumnya = kunci
+        yield kunci, entry
+
+
+def merge_leaderboards(paths):
+    """Gabungkan beberapa leaderboard terurut dengan k-way merge.
+
+    Setiap input harus terurut menurut (skor menurun, tanggal menaik); input
+    yang tidak terurut ditolak dengan ValueError. Karena itu entri identik
+    (nama, mode, level, tanggal) dengan skor yang sama selalu berada dalam
+    satu kelompok kunci yang bersebelahan, sehingga cukup kelompok yang sedang
+    diproses yang diingat untuk membuang duplikat.
+    """
+    sumber = [_cek_terurut(path, iter_leaderboard_file(path)) for path in paths]
+    kelompok = None
+    sudah_ada = set()
+
+    for kunci_urutan, entry in heapq.merge(*sumber, key=lambda item: item[0]):
+        if kunci_urutan != kelompok:
+            kelompok = kunci_urutan
+            sudah_ada.clear()
+
+        kunci = (entry.get("nama"), entry.get("mode"), entry.get("level"), entry["tanggal"])
+        if kunci in sudah_ada:
+            continue
+        sudah_ada.add(kunci)
+        yield entry
+
+
+def tulis_leaderboard(entries, path):
+    """Tulis entri secara streaming dalam format yang dibaca load_leaderboard.
+
+    Hasil ditulis ke file sementara lalu dipindahkan ke path hanya jika semua
+    entri berhasil ditulis, sehingga path aman dipakai juga sebagai input.
+    Permission file tujuan dipertahankan (atau default umask untuk file baru).
+    """
+    jumlah = 0
+    fd, path_sementara = tempfile.mkstemp(
+        prefix='.leaderboard-', suffix='.tmp', dir=os.path.dirname(os.path.abspath(path))
+    )
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for entry in entries:
+                teks = json.dumps(entry, indent=2).replace('\n', '\n  ')
+                f.write(('\n  ' if jumlah == 0 else ',\n  ') + teks)
+                jumlah += 1
+            f.write('\n]' if jumlah else ']')
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(path_sementara, mode)
+        os.replace(path_sementara, path)
+    except BaseException:
+        os.remove(path_sementara)
+        raise
+    return jumlah
+
+
+# ==================== SPECTATOR SERVER ====================
+class LeaderboardServer:
+    """Server HTTP read-only di localhost untuk layar penonton.
+
+    Thread Tk hanya menukar snapshot leaderboard lewat perbarui(); halaman JSON
+    dihitung di thread server sekali per (mode, level) lalu disimpan di cache
+    sampai snapshot berikutnya.
+    """
+
+    MODE = ("Semua", "Solo", "Offline")
+
+    def __init__(self, host='127.0.0.1', port=8765, level=(), batas=50, timeout_idle=30):
+        self.host = host
+        self.port = port
+        self.level = ("Semua",) + tuple(level)
+        self.batas = batas
+        self.timeout_idle = timeout_idle
+        self._snapshot = ((), {})
+        self._loop = None
+        self._thread = None
+        self._server = None
+        self._koneksi = set()
+
+    def perbarui(self, leaderboard):
+        """Ganti snapshot leaderboard dan kosongkan cache halaman"""
+        self._snapshot = (tuple(leaderboard), {})
+
+    def mulai(self):
+        """Jalankan event loop asyncio di thread terpisah"""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._jalankan, name="spectator-server", daemon=True)
+        self._thread.start()
+
+    def hentikan(self, timeout=5):
+        """Tutup semua koneksi, hentikan event loop dan tunggu thread selesai"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        asyncio.run_coroutine_threadsafe(self._berhenti(), self._loop)
+        self._thread.join(timeout)
+
+    def _jalankan(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._layani, self.host, self.port)
+            )
+        except OSError as e:
+            logging.error(f"Gagal menjalankan spectator server: {e}")
+            self._loop.close()
+            return
+        logging.info(f"Spectator server berjalan di http://{self.host}:{self.port}/leaderboard")
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _berhenti(self):
+        self._server.close()
+        koneksi = list(self._koneksi)
+        for task in koneksi:
+            task.cancel()
+        await asyncio.gather(*koneksi, return_exceptions=True)
+        await self._server.wait_closed()
+        self._loop.stop()
+
+    def _halaman(self, mode, level):
+        """Ambil halaman (body, etag) dari cache atau hitung sekali"""
+        data, cache = self._snapshot
+        kunci = (mode, level)
+        halaman = cache.get(kunci)
+        if halaman is None:
+            entries = [
+                entry for entry in data
+                if (mode == "Semua" or entry["mode"] == mode)
+                and (level == "Semua" or entry["level"] == level)
+            ][:self.batas]
+            body = json.dumps({
+                "mode": mode,
+                "level": level,
+                "leaderboard": [dict(entry, peringkat=i) for i, entry in enumerate(entries, 1)]
+            }).encode('utf-8')
+            etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+            halaman = cache[kunci] = (body, etag)
+        return halaman
+
+    def _jawab(self, method, target, headers):
+        """Bangun (status, headers, body) untuk satu request"""
+        if method not in ("GET", "HEAD"):
+            return "405 Method Not Allowed", {"Allow": "GET, HEAD"}, b""
+
+        url = urlsplit(target)
+        if url.path not in ("/", "/leaderboard"):
+            return "404 Not Found", {}, b""
+
+        query = parse_qs(url.query)
+        mode = query.get("mode", ["Semua"])[0]
+        level = query.get("level", ["Semua"])[0]
+        if mode not in self.MODE or level not in self.level:
+            return "400 Bad Request", {}, b""
+        body, etag = self._halaman(mode, level)
+
+        header_respons = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = headers.get("if-none-match")
+        # If-None-Match memakai perbandingan lemah (RFC 7232): abaikan awalan W/
+        if if_none_match and (if_none_match.strip() == "*" or etag in (
+                t.strip().removeprefix("W/") for t in if_none_match.split(","))):
+            return "304 Not Modified", header_respons, b""
+
+        header_respons["Content-Type"] = "application/json; charset=utf-8"
+        return "200 OK", header_respons, body
+
+    async def _layani(self, reader, writer):
+        """Layani satu koneksi (mendukung keep-alive untuk polling)"""
+        task = asyncio.current_task()
+        self._koneksi.add(task)
+        try:
+            while True:
+                baris = await asyncio.wait_for(reader.readline(), self.timeout_idle)
+                if not baris:
+                    break
+
+                headers = {}
+                while True:
+                    header = await asyncio.wait_for(reader.readline(), self.timeout_idle)
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    nama, _, nilai = header.decode('latin-1').partition(":")
+                    headers[nama.strip().lower()] = nilai.strip()
+
+                bagian = baris.decode('latin-1').split()
+                if len(bagian) != 3:
+                    status, header_respons, body = "400 Bad Request", {}, b""
+                    headers["connection"] = "close"
+                else:
+                    status, header_respons, body = self._jawab(bagian[0], bagian[1], headers)
+
+                # Body request tidak dibaca, jadi koneksi ditutup agar tidak
+                # terbaca sebagai request berikutnya
+                ada_body = headers.get("content-length", "0").strip() != "0" or "transfer-encoding" in headers
+                tutup = (
+                    headers.get("connection", "").lower() == "close"
+                    or bagian[-1:] == ["HTTP/1.0"]
+                    or bagian[:1] not in (["GET"], ["HEAD"])
+                    or ada_body
+                )
+                header_respons["Content-Length"] = str(len(body))
+                header_respons["Connection"] = "close" if tutup else "keep-alive"
+
+                respons = f"HTTP/1.1 {status}\r\n" + "".join(
+                    f"{nama}: {nilai}\r\n" for nama, nilai in header_respons.items()
+                ) + "\r\n"
+                writer.write(respons.encode('latin-1') + (b"" if bagian[:1] == ["HEAD"] else body))
+                await writer.drain()
+                if tutup:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Server sedang dihentikan
+            pass
+        finally:
+            self._koneksi.discard(task)
+            writer.close()
+
+
+# ==================== PROFILING ====================
+class LatencyHistogram:
+    """Histogram latensi (ns) dengan bucket logaritmik, 4 sub-bucket per pangkat dua"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Kosongkan histogram"""
+        self.bucket = [0] * 256
+        self.jumlah = 0
+        self.maks = 0
+
+    def catat(self, ns):
+        """Catat satu durasi dalam nanodetik"""
+        if ns < 8:
+            idx = ns
+        else:
+            bl = ns.bit_length()
+            idx = ((bl - 2) << 2) | ((ns >> (bl - 3)) & 3)
+        self.bucket[idx] += 1
+        self.jumlah += 1
+        if ns > self.maks:
+            self.maks = ns
+
+    @staticmethod
+    def _batas_bawah(idx):
+        if idx < 8:
+            return idx
+        return (4 | (idx & 3)) << ((idx >> 2) - 1)
+
+    def persentil(self, p):
+        """Perkiraan persentil p (0-1) dalam nanodetik"""
+        if not self.jumlah:
+            return 0
+        target = max(1, round(p * self.jumlah))
+        kumulatif = 0
+        for idx, n in enumerate(self.bucket):
+            kumulatif += n
+            if kumulatif >= target:
+                return min(self._batas_bawah(idx + 1), self.maks)
+        return self.maks
+
+
+class Profiler:
+    """Instrumentasi waktu untuk method hot-path game.
+
+    Saat nonaktif method tidak dibungkus sama sekali sehingga tidak ada overhead.
+    """
+
+    def __init__(self, target, nama_method):
+        self.target = target
+        self.nama_method = nama_method
+        self.histogram = {nama: LatencyHistogram() for nama in nama_method}
+        self.aktif = False
+        self.rekam_sesi = False
+        self._cprofile = None
+        self._waktu_dialog = 0
+
+    def aktifkan(self):
+        """Bungkus setiap method target dengan pengukur waktu"""
+        if self.aktif:
+            return
+        for nama in self.nama_method:
+            setattr(self.target, nama, self._bungkus(getattr(self.target, nama), self.histogram[nama]))
+        self.aktif = True
+
+    def nonaktifkan(self):
+        """Kembalikan method asli"""
+        for nama in self.nama_method:
+            vars(self.target).pop(nama, None)
+        self.aktif = False
+
+    def _bungkus(self, fungsi, histogram):
+        perf_counter_ns = time.perf_counter_ns
+
+        def terukur(*args, **kwargs):
+            mulai = perf_counter_ns()
+            dialog_awal = self._waktu_dialog
+            try:
+                return fungsi(*args, **kwargs)
+            finally:
+                durasi = perf_counter_ns() - mulai - (self._waktu_dialog - dialog_awal)
+                histogram.catat(durasi)
+        return terukur
+
+    def dialog(self, fungsi, *args, **kwargs):
+        """Panggil dialog modal; waktu menunggu pemain tidak masuk histogram"""
+        mulai = time.perf_counter_ns()
+        try:
+            return fungsi(*args, **kwargs)
+        finally:
+            self._waktu_dialog += time.perf_counter_ns() - mulai
+
+    def reset(self):
+        """Kosongkan semua histogram"""
+        for histogram in self.histogram.values():
+            histogram.reset()
+
+    def ringkasan(self):
+        """Ringkasan jumlah panggilan dan latensi (mikrodetik) per method"""
+        return [
+            {
+                "method": nama,
+                "jumlah": h.jumlah,
+                "p50_us": h.persentil(0.50) / 1000,
+                "p99_us": h.persentil(0.99) / 1000,
+                "maks_us": h.maks / 1000
+            }
+            for nama, h in self.histogram.items()
+        ]
+
+    def ekspor(self, path):
+        """Simpan ringkasan ke file JSON"""
+        with open(path, 'w') as f:
+            json.dump(self.ringkasan(), f, indent=2)
+
+    def mulai_sesi(self):
+        """Mulai cProfile untuk satu sesi permainan jika diminta"""
+        if self.rekam_sesi and self._cprofile is None:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def selesai_sesi(self):
+        """Hentikan cProfile sesi dan simpan hasilnya; kembalikan nama file"""
+        if self._cprofile is None:
+            return None
+        self._cprofile.disable()
+        path = datetime.now().strftime("sesi_%Y%m%d_%H%M%S.prof")
+        self._cprofile.dump_stats(path)
+        self._cprofile = None
+        self.rekam_sesi = False
+        logging.info(f"Profil sesi disimpan ke {path}")
+        return path
+
+
+# ==================== SNAPSHOT ====================
+SNAPSHOT_MAGIC = b'TAS1'
+SNAPSHOT_MODE = ("solo", "offline")
+OP_TEBAKAN = 1
+OP_BATAL = 2
+
+_HEADER = struct.Struct('<BBiB')        # mode, pemain_aktif, kode_rahasia, jumlah pemain
+_PEMAIN = struct.Struct('<BHH?')        # id, skor, nyawa, petunjuk
+_PANJANG = struct.Struct('<H')
+_REKAMAN = struct.Struct('<BBiBBBB')    # op, pemain, tebakan, jam, menit, detik, pemain_aktif
+
+
+def _pack_teks(teks):
+    data = teks.encode('utf-8')
+    return _PANJANG.pack(len(data)) + data
+
+
+def _unpack_teks(data, pos):
+    (panjang,) = _PANJANG.unpack_from(data, pos)
+    pos += _PANJANG.size
+    return data[pos:pos + panjang].decode('utf-8'), pos + panjang
+
+
+def encode_snapshot_header(mode, level, kode_rahasia, pemain_aktif, pemain):
+    """Encode state awal permainan ke header snapshot biner"""
+    bagian = [
+        SNAPSHOT_MAGIC,
+        _HEADER.pack(SNAPSHOT_MODE.index(mode), pemain_aktif, kode_rahasia, len(pemain)),
+        _pack_teks(level)
+    ]
+    for pemain_id, info in pemain.items():
+        bagian.append(_PEMAIN.pack(pemain_id, info["skor"], info["nyawa"], info["petunjuk"]))
+        bagian.append(_pack_teks(info["nama"]))
+    return b''.join(bagian)
+
+
+def encode_snapshot_rekaman(op, pemain_id, tebakan, waktu, pemain_aktif):
+    """Encode satu aksi (tebakan/batal) berukuran tetap"""
+    jam, menit, detik = (int(x) for x in waktu.split(":"))
+    return _REKAMAN.pack(op, pemain_id, tebakan, jam, menit, detik, pemain_aktif)
+
+
+def baca_snapshot(path):
+    """Baca snapshot: kembalikan (header, daftar rekaman, offset akhir).
+
+    Rekaman terakhir yang terpotong (misalnya karena program berhenti saat
+    menulis) dilewati; offset akhir menunjuk ke akhir rekaman utuh terakhir
+    sehingga file dapat dipotong sebelum rekaman baru ditambahkan.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ValueError("Format snapshot tidak dikenal")
+
+    pos = len(SNAPSHOT_MAGIC)
+    mode, pemain_aktif, kode_rahasia, jumlah = _HEADER.unpack_from(data, pos)
+    pos += _HEADER.size
+    level, pos = _unpack_teks(data, pos)
+
+    pemain = {}
+    for _ in range(jumlah):
+        pemain_id, skor, nyawa, petunjuk = _PEMAIN.unpack_from(data, pos)
+        pos += _PEMAIN.size
+        nama, pos = _unpack_teks(data, pos)
+        pemain[pemain_id] = {"nama": nama, "skor": skor, "nyawa": nyawa, "petunjuk": petunjuk}
+
+    header = {
+        "mode": SNAPSHOT_MODE[mode],
+        "level": level,
+        "kode_rahasia": kode_rahasia,
+        "pemain_aktif": pemain_aktif,
+        "pemain": pemain
+    }
+    akhir = pos + (len(data) - pos) // _REKAMAN.size * _REKAMAN.size
+    rekaman = [
+        (op, pemain_id, tebakan, f"{jam:02d}:{menit:02d}:{detik:02d}", aktif)
+        for op, pemain_id, tebakan, jam, menit, detik, aktif in _REKAMAN.iter_unpack(data[pos:akhir])
+    ]
+    return header, rekaman, akhir
+
+
+class SnapshotWriter:
+    """Penulis checkpoint append-only yang berjalan di thread terpisah.
+
+    Thread Tk hanya memasukkan bytes ke antrian; header ditulis sekali saat
+    permainan dimulai dan setiap aksi menambah satu rekaman berukuran tetap.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.ada = os.path.exists(path)
+        self._antrian = queue.Queue()
+        self._thread = threading.Thread(target=self._jalankan, name="snapshot-writer", daemon=True)
+        self._thread.start()
+
+    def mulai_baru(self, header):
+        """Timpa snapshot dengan header permainan baru"""
+        self.ada = True
+        self._antrian.put(('w', header))
+
+    def tambah(self, rekaman):
+        """Tambahkan satu rekaman aksi"""
+        self._antrian.put(('a', rekaman))
+
+    def hapus(self):
+        """Hapus snapshot (permainan selesai)"""
+        self.ada = False
+        self._antrian.put(('d', None))
+
+    def potong(self, offset):
+        """Buang bytes setelah offset (rekaman terpotong) sebelum append berikutnya"""
+        self._antrian.put(('t', offset))
+
+    def tunggu(self):
+        """Tunggu sampai semua checkpoint tertulis"""
+        self._antrian.join()
+
+    def tutup(self):
+        """Tulis sisa antrian lalu hentikan thread"""
+        self._antrian.put(None)
+        self._thread.join()
+
+    def _jalankan(self):
+        f = None
+        while True:
+            item = self._antrian.get()
+            try:
+                if item is None:
+                    return
+                op, data = item
+                if op == 'w':
+                    if f is not None:
+                        f.close()
+                    f = open(self.path, 'wb')
+                    f.write(data)
+                elif op == 'a':
+                    if f is None:
+                        f = open(self.path, 'ab')
+                    f.write(data)
+                elif op == 't':
+                    if f is not None:
+                        f.close()
+                        f = None
+                    os.truncate(self.path, data)
+                elif op == 'd':
+                    if f is not None:
+                        f.close()
+                        f = None
+                    try:
+                        os.remove(self.path)
+                    except FileNotFoundError:
+                        pass
+                if f is not None and self._antrian.empty():
+                    f.flush()
+            except OSError as e:
+                logging.error(f"Gagal menulis snapshot: {e}")
+            finally:
+                if item is None and f is not None:
+                    f.close()
+                self._antrian.task_done()
+
+
 class TebakAngkaGame:
     def __init__(self, root):
         self.root = root
         self.setup_logging()
         self.load_config()
+        self.setup_profiler()
         self.init_game_state()
         self.setup_ui()
         self.load_leaderboard()
+        self.setup_spectator_server()
+        self.snapshot = SnapshotWriter('snapshot.bin')
         self.tampilkan_menu_utama()
 
     # ==================== INITIAL SETUP ====================
@@ -36,6 +646,8 @@ class TebakAngkaGame:
                     'Sulit': {'range': (1, 200), 'nyawa': 5, 'petunjuk': False},
                     'Expert': {'range': (1, 500), 'nyawa': 3, 'petunjuk': False}
                 })
+                self.spectator_port = config.get('spectator_port')
+                self.profiling = config.get('profiling', False)
         except FileNotFoundError:
             logging.warning("Config file not found, using defaults")
             self.tingkat_kesulitan = {
@@ -44,6 +656,35 @@ class TebakAngkaGame:
                 'Sulit': {'range': (1, 200), 'nyawa': 5, 'petunjuk': False},
                 'Expert': {'range': (1, 500), 'nyawa': 3, 'petunjuk': False}
             }
+            self.spectator_port = None
+            self.profiling = False
+
+    def setup_spectator_server(self):
+        """Jalankan spectator server jika 'spectator_port' diatur di config"""
+        self.spectator_server = None
+        if self.spectator_port:
+            self.spectator_server = LeaderboardServer(
+                port=self.spectator_port, level=self.tingkat_kesulitan
+            )
+            self.spectator_server.perbarui(self.leaderboard)
+            self.spectator_server.mulai()
+
+    def setup_profiler(self):
+        """Siapkan instrumentasi waktu (aktif jika 'profiling' diatur di config)"""
+        self.profiler = Profiler(self, (
+            'aksi_tebakan',
+            'proses_tebakan_solo',
+            'proses_tebakan_offline',
+            'update_info_pemain',
+            'update_riwayat_tebakan',
+            'update_petunjuk',
+            'update_leaderboard_display',
+            'save_leaderboard',
+            'load_leaderboard'
+        ))
+        if self.profiling:
+            self.profiler.aktifkan()
+        self.root.bind('<F12>', self.toggle_overlay_profiling)
 
     def init_game_state(self):
         """Inisialisasi state permainan"""
@@ -117,12 +758,20 @@ class TebakAngkaGame:
         """Tampilkan menu utama"""
         self.clear_content()
         self.mode = "menu"
+        self.profiler.selesai_sesi()
         
         ttk.Label(self.content_frame, text="Pilih Mode Permainan:").pack(pady=(20, 10))
         
         btn_frame = ttk.Frame(self.content_frame)
         btn_frame.pack(pady=10)
         
+        if self.snapshot.ada:
+            ttk.Button(
+                btn_frame,
+                text="LANJUTKAN PERMAINAN TERAKHIR",
+                command=self.lanjutkan_permainan
+            ).pack(fill=tk.X, pady=5)
+
         buttons = [
             ("SOLO PLAYER", self.tampilkan_menu_level),
             ("MULTIPLAYER OFFLINE", self.tampilkan_menu_multiplayer),
@@ -179,6 +828,7 @@ class TebakAngkaGame:
         self.kode_rahasia = self.generate_secret_number(self.level_terpilih)
         self.riwayat_tebakan = []
         self.mode = "solo"
+        self.checkpoint_baru()
         self.tampilkan_game_ui()
 
     def tampilkan_menu_multiplayer(self):
@@ -254,12 +904,14 @@ class TebakAngkaGame:
         self.riwayat_tebakan = []
         self.pemain_aktif = 1
         self.mode = "offline"
+        self.checkpoint_baru()
         self.tampilkan_game_ui()
 
     # ==================== GAME UI ====================
     def tampilkan_game_ui(self):
         """Tampilkan antarmuka permainan"""
         self.clear_content()
+        self.profiler.mulai_sesi()
         
         # Label giliran pemain
         self.label_giliran = ttk.Label(
@@ -278,7 +930,7 @@ class TebakAngkaGame:
         self.entry_tebakan.pack(side=tk.LEFT)
         self.entry_tebakan.bind('<Return>', lambda e: self.aksi_tebakan())
         
-        self.btn_tebak = ttk.Button(tebakan_frame, text="TEBAK", command=self.aksi_tebakan)
+        self.btn_tebak = ttk.Button(tebakan_frame, text="TEBAK", command=lambda: self.aksi_tebakan())
         self.btn_tebak.pack(side=tk.LEFT, padx=5)
 
         # Riwayat tebakan
@@ -331,12 +983,12 @@ class TebakAngkaGame:
         try:
             tebakan = int(tebakan_str)
         except ValueError:
-            messagebox.showerror("Error", "Tebakan harus berupa angka")
+            self.profiler.dialog(messagebox.showerror, "Error", "Tebakan harus berupa angka")
             return
             
         level_info = self.tingkat_kesulitan[self.level_terpilih]
         if not (1 <= tebakan <= level_info["range"][1]):
-            messagebox.showerror("Error", f"Tebakan harus antara 1 - {level_info['range'][1]}")
+            self.profiler.dialog(messagebox.showerror, "Error", f"Tebakan harus antara 1 - {level_info['range'][1]}")
             return
             
         self.entry_tebakan.delete(0, tk.END)
@@ -359,19 +1011,22 @@ class TebakAngkaGame:
         self.pemain[1]["nyawa"] -= 1
         
         if tebakan == self.kode_rahasia:
+            self.snapshot.hapus()
             self.pemain[1]["skor"] += 1
             self.add_to_leaderboard("Anda", self.pemain[1]["skor"], "Solo", self.level_terpilih)
             self.update_riwayat_tebakan()
-            messagebox.showinfo("Selamat!", f"Anda menang! Angka rahasia: {self.kode_rahasia}")
+            self.profiler.dialog(messagebox.showinfo, "Selamat!", f"Anda menang! Angka rahasia: {self.kode_rahasia}")
             self.tampilkan_menu_utama()
             return
         
         if self.pemain[1]["nyawa"] <= 0:
+            self.snapshot.hapus()
             self.update_riwayat_tebakan()
-            messagebox.showinfo("Game Over", f"Anda kalah! Angka rahasia: {self.kode_rahasia}")
+            self.profiler.dialog(messagebox.showinfo, "Game Over", f"Anda kalah! Angka rahasia: {self.kode_rahasia}")
             self.tampilkan_menu_utama()
             return
         
+        self.checkpoint_tebakan(OP_TEBAKAN, 1, tebakan, waktu)
         self.update_info_pemain()
         self.update_riwayat_tebakan()
         self.update_petunjuk(tebakan)
@@ -389,6 +1044,7 @@ class TebakAngkaGame:
         self.pemain[self.pemain_aktif]["nyawa"] -= 1
         
         if tebakan == self.kode_rahasia:
+            self.snapshot.hapus()
             self.pemain[self.pemain_aktif]["skor"] += 1
             self.add_to_leaderboard(
                 self.pemain[self.pemain_aktif]['nama'], 
@@ -397,18 +1053,21 @@ class TebakAngkaGame:
                 self.level_terpilih
             )
             self.update_riwayat_tebakan()
-            messagebox.showinfo("Selamat!", f"{self.pemain[self.pemain_aktif]['nama']} menang! Angka rahasia: {self.kode_rahasia}")
+            self.profiler.dialog(messagebox.showinfo, "Selamat!", f"{self.pemain[self.pemain_aktif]['nama']} menang! Angka rahasia: {self.kode_rahasia}")
             self.tampilkan_menu_utama()
             return
         
         if all(p["nyawa"] <= 0 for p in self.pemain.values()):
+            self.snapshot.hapus()
             self.update_riwayat_tebakan()
-            messagebox.showinfo("Game Over", f"Semua pemain kalah! Angka rahasia: {self.kode_rahasia}")
+            self.profiler.dialog(messagebox.showinfo, "Game Over", f"Semua pemain kalah! Angka rahasia: {self.kode_rahasia}")
             self.tampilkan_menu_utama()
             return
         
         # Ganti giliran ke pemain berikutnya
+        pemain_id = self.pemain_aktif
         self.next_player()
+        self.checkpoint_tebakan(OP_TEBAKAN, pemain_id, tebakan, waktu)
         
         self.update_info_pemain()
         self.update_riwayat_tebakan()
@@ -433,6 +1092,7 @@ class TebakAngkaGame:
             pemain_id = tebakan_dibatalkan["pemain"]
             self.pemain[pemain_id]["nyawa"] += 1
             self.pemain_aktif = pemain_id
+            self.checkpoint_tebakan(OP_BATAL, pemain_id, 0, tebakan_dibatalkan["waktu"])
             
             self.update_info_pemain()
             self.update_riwayat_tebakan()
@@ -440,6 +1100,72 @@ class TebakAngkaGame:
         else:
             messagebox.showwarning("Peringatan", "Tidak ada tebakan untuk dibatalkan")
 
+    # ==================== SNAPSHOT ====================
+    def checkpoint_baru(self):
+        """Mulai snapshot baru untuk permainan yang baru dimulai"""
+        self.snapshot.mulai_baru(encode_snapshot_header(
+            self.mode, self.level_terpilih, self.kode_rahasia, self.pemain_aktif, self.pemain
+        ))
+
+    def checkpoint_tebakan(self, op, pemain_id, tebakan, waktu):
+        """Catat satu aksi ke snapshot"""
+        self.snapshot.tambah(encode_snapshot_rekaman(op, pemain_id, tebakan, waktu, self.pemain_aktif))
+
+    def lanjutkan_permainan(self):
+        """Pulihkan permainan terakhir dari snapshot"""
+        self.snapshot.tunggu()
+        try:
+            header, rekaman, akhir = baca_snapshot(self.snapshot.path)
+            pemain = header["pemain"]
+            if header["level"] not in self.tingkat_kesulitan:
+                raise ValueError(f"Level {header['level']} tidak ada di konfigurasi")
+
+            # Replay ke variabel lokal; state game baru diganti jika semua valid
+            pemain_aktif = header["pemain_aktif"]
+            riwayat = []
+            for op, pemain_id, tebakan, waktu, aktif in rekaman:
+                if pemain_id not in pemain or aktif not in pemain:
+                    raise ValueError(f"Pemain {pemain_id} tidak ada di snapshot")
+                if op == OP_TEBAKAN:
+                    riwayat.append({"waktu": waktu, "pemain": pemain_id, "tebakan": tebakan})
+                    pemain[pemain_id]["nyawa"] -= 1
+                elif op == OP_BATAL and riwayat:
+                    riwayat.pop()
+                    pemain[pemain_id]["nyawa"] += 1
+                else:
+                    raise ValueError(f"Rekaman snapshot tidak valid (op {op})")
+                pemain_aktif = aktif
+            if pemain_aktif not in pemain:
+                raise ValueError(f"Pemain {pemain_aktif} tidak ada di snapshot")
+        except (OSError, ValueError, KeyError, IndexError, struct.error) as e:
+            logging.warning(f"Snapshot tidak dapat dibaca: {e}")
+            self.snapshot.hapus()
+            messagebox.showerror("Error", "Permainan terakhir tidak dapat dipulihkan")
+            self.tampilkan_menu_utama()
+            return
+
+        self.snapshot.potong(akhir)
+        self.mode = header["mode"]
+        self.level_terpilih = header["level"]
+        self.kode_rahasia = header["kode_rahasia"]
+        self.pemain = pemain
+        self.pemain_aktif = pemain_aktif
+        self.riwayat_tebakan = riwayat
+        for tebak in riwayat:
+            tebak["hasil"] = self.analisis_tebakan(tebak["tebakan"])
+
+        logging.info(f"Permainan dilanjutkan dari snapshot ({len(rekaman)} aksi)")
+        self.tampilkan_game_ui()
+        if self.riwayat_tebakan:
+            self.update_petunjuk(self.riwayat_tebakan[-1]["tebakan"])
+
+    def tutup(self):
+        """Selesaikan pekerjaan latar belakang sebelum program keluar"""
+        self.profiler.selesai_sesi()
+        self.snapshot.tutup()
+        if self.spectator_server is not None:
+            self.spectator_server.hentikan()
+
     # ==================== CHAT SYSTEM ====================
     def tampilkan_chat(self):
         """Tampilkan window chat untuk multiplayer"""
@@ -651,6 +1377,7 @@ class TebakAngkaGame:
         if messagebox.askyesno("Konfirmasi", "Apakah Anda yakin ingin mereset leaderboard? Semua data akan hilang."):
             self.leaderboard = []
             self.save_leaderboard()
+            self.sinkronkan_spectator()
             self.update_leaderboard_display()
             messagebox.showinfo("Info", "Leaderboard telah direset")
 
@@ -673,8 +1400,14 @@ class TebakAngkaGame:
             "tanggal": datetime.now().strftime("%d-%m-%Y %H:%M:%S")
         }
         self.leaderboard.append(entry)
-        self.leaderboard = sorted(self.leaderboard, key=lambda x: x["skor"], reverse=True)
+        self.leaderboard = sorted(self.leaderboard, key=_urutan_entri)
         self.save_leaderboard()
+        self.sinkronkan_spectator()
+
+    def sinkronkan_spectator(self):
+        """Kirim snapshot leaderboard terbaru ke spectator server"""
+        if self.spectator_server is not None:
+            self.spectator_server.perbarui(self.leaderboard)
 
     def save_leaderboard(self):
         """Simpan leaderboard ke file"""
@@ -684,6 +1417,95 @@ class TebakAngkaGame:
         except Exception as e:
             logging.error(f"Gagal menyimpan leaderboard: {e}")
 
+    # ==================== PROFILING ====================
+    def toggle_overlay_profiling(self, event=None):
+        """Buka/tutup overlay latensi (tombol F12)"""
+        if hasattr(self, 'overlay_window') and self.overlay_window.winfo_exists():
+            self.tutup_overlay_profiling()
+            return
+
+        self.overlay_window = tk.Toplevel(self.root)
+        self.overlay_window.protocol("WM_DELETE_WINDOW", self.tutup_overlay_profiling)
+        self.overlay_window.bind('<F12>', self.toggle_overlay_profiling)
+        self.overlay_window.title("Profiling")
+        self.overlay_window.geometry("520x320")
+        self.overlay_window.attributes('-topmost', True)
+
+        frame = ttk.Frame(self.overlay_window)
+        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        columns = ("Method", "Jumlah", "p50", "p99", "Maks")
+        self.overlay_tree = ttk.Treeview(frame, columns=columns, show="headings", height=10)
+        for col in columns:
+            self.overlay_tree.heading(col, text=col)
+            self.overlay_tree.column(col, width=80 if col != "Method" else 180, anchor=tk.CENTER)
+        self.overlay_tree.pack(fill=tk.BOTH, expand=True)
+
+        btn_frame = ttk.Frame(frame)
+        btn_frame.pack(fill=tk.X, pady=(10, 0))
+
+        self.profiling_aktif = tk.BooleanVar(value=self.profiler.aktif)
+        ttk.Checkbutton(
+            btn_frame, text="Aktif", variable=self.profiling_aktif,
+            command=self.toggle_profiling
+        ).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Reset", command=self.profiler.reset).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Ekspor", command=self.ekspor_profiling).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Rekam Sesi", command=self.rekam_sesi_profiling).pack(side=tk.LEFT, padx=5)
+
+        self.update_overlay_profiling()
+
+    def tutup_overlay_profiling(self):
+        """Tutup overlay dan hentikan refresh berkala"""
+        self.overlay_window.after_cancel(self.overlay_after)
+        self.overlay_window.destroy()
+
+    def toggle_profiling(self):
+        """Aktifkan/nonaktifkan instrumentasi waktu"""
+        if self.profiling_aktif.get():
+            self.profiler.aktifkan()
+        else:
+            self.profiler.nonaktifkan()
+
+    def update_overlay_profiling(self):
+        """Perbarui isi overlay setiap 500 ms selama window terbuka"""
+        if not self.overlay_window.winfo_exists():
+            return
+
+        for item in self.overlay_tree.get_children():
+            self.overlay_tree.delete(item)
+
+        for baris in self.profiler.ringkasan():
+            self.overlay_tree.insert("", tk.END, values=(
+                baris["method"],
+                baris["jumlah"],
+                f"{baris['p50_us']:.0f} µs",
+                f"{baris['p99_us']:.0f} µs",
+                f"{baris['maks_us']:.0f} µs"
+            ))
+
+        self.overlay_after = self.overlay_window.after(500, self.update_overlay_profiling)
+
+    def ekspor_profiling(self):
+        """Ekspor ringkasan latensi ke profiling.json"""
+        try:
+            self.profiler.ekspor('profiling.json')
+            messagebox.showinfo("Info", "Profiling disimpan ke profiling.json", parent=self.overlay_window)
+        except OSError as e:
+            logging.error(f"Gagal menyimpan profiling: {e}")
+            messagebox.showerror("Error", f"Gagal menyimpan profiling: {e}", parent=self.overlay_window)
+
+    def rekam_sesi_profiling(self):
+        """Rekam cProfile untuk satu sesi permainan berikutnya"""
+        self.profiler.rekam_sesi = True
+        if self.mode in ("solo", "offline"):
+            self.profiler.mulai_sesi()
+        messagebox.showinfo(
+            "Info",
+            "cProfile akan direkam sampai permainan selesai (file sesi_*.prof)",
+            parent=self.overlay_window
+        )
+
     # ==================== PANDUAN ====================
     def tampilkan_panduan(self):
         """Tampilkan panduan permainan"""
@@ -735,6 +1557,26 @@ class TebakAngkaGame:
         ).pack(fill=tk.X, pady=(10, 0))
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Game Tebak Angka")
+    parser.add_argument(
+        '--merge', nargs='+', metavar='FILE',
+        help="Gabungkan leaderboard dari beberapa mesin lalu keluar"
+    )
+    parser.add_argument(
+        '-o', '--output', default='leaderboard.json',
+        help="File hasil penggabungan leaderboard (default: leaderboard.json)"
+    )
+    args = parser.parse_args()
+
+    if args.merge:
+        try:
+            jumlah = tulis_leaderboard(merge_leaderboards(args.merge), args.output)
+        except (OSError, ValueError) as e:
+            parser.exit(1, f"Gagal menggabungkan leaderboard: {e}\n")
+        print(f"{jumlah} entri ditulis ke {args.output}")
+        raise SystemExit(0)
+
     root = tk.Tk()
     game = TebakAngkaGame(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    game.tutup()
\ No newline at end of file